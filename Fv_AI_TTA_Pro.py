@@ -1,7 +1,12 @@
 import requests
+import io
 import json
 import os
+import struct
 import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import re
 
@@ -68,14 +73,302 @@ DEFAULT_CONFIG = {
         "advertisement-upbeat": " upbeat广告"
     },
     "format_options": ["mp3", "wav", "ogg"],
+    # 单次语音生成的总时限（秒），覆盖请求、下载和写入
+    "request_deadline": 60,
+    # 对冲请求：等待超过近期耗时的指定百分位后，再发出一个相同请求，先完成者胜出
+    "hedging": {
+        "enabled": False,
+        "percentile": 95,    # 触发对冲的耗时百分位
+        "min_delay": 2.0,    # 最短等待时间（秒）
+        "max_ratio": 0.1     # 对冲请求占总请求的最大比例，限制额外消耗的额度
+    },
     "history": []
 }
 
+# 用于计算对冲延迟的近期耗时样本数
+LATENCY_WINDOW = 100
+# 样本不足时使用 min_delay 作为对冲延迟
+MIN_LATENCY_SAMPLES = 5
+
+# MP3 (Layer III) 比特率表 (kbps)，按 MPEG-1 / MPEG-2(2.5) 区分
+MP3_BITRATES = {
+    1: [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    2: [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160]
+}
+# MP3 采样率表 (Hz)，键为版本位
+MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000]    # MPEG-2.5
+}
+
+
+def format_duration(seconds):
+    """将秒数格式化为 m:ss"""
+    if seconds is None:
+        return "未知"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    return f"{minutes}:{secs:02d}"
+
+
+class AudioInfoParser:
+    """在下载音频时逐块解析文件头 (MP3 帧头、WAV RIFF、OGG 页)，获取时长等信息
+
+    只保留开头一小段数据和末尾若干字节，不需要再次读取完整音频。
+    """
+
+    HEAD_LIMIT = 16 * 1024   # 保留的开头字节数（遇到 ID3v2 标签时自动扩展）
+    TAIL_LIMIT = 128         # 保留的末尾字节数（用于检测 ID3v1 标签）
+
+    def __init__(self):
+        self.size = 0
+        self._head = bytearray()
+        self._head_limit = self.HEAD_LIMIT
+        self._tail = b""
+        self._format = None
+        self._ogg_header = bytearray()  # 当前正在读取的 OGG 页头
+        self._ogg_skip = 0              # 当前页剩余待跳过的数据字节数
+        self._ogg_synced = True         # 页边界是否仍然对齐
+        self._ogg_granule = None
+
+    def feed(self, chunk):
+        """输入下载到的一块数据"""
+        self.size += len(chunk)
+        rest = chunk
+        if len(self._head) < self._head_limit:
+            taken = min(len(chunk), self._head_limit - len(self._head))
+            self._head.extend(chunk[:taken])
+            if self._format is None and len(self._head) >= 10:
+                self._detect_format()
+                # ID3v2 标签会扩大 head 上限，补齐当前块剩余数据，保证 head 是连续的文件开头
+                more = min(len(chunk) - taken, self._head_limit - len(self._head))
+                if more > 0:
+                    self._head.extend(chunk[taken:taken + more])
+                    taken += more
+                if self._format == "ogg":
+                    # 检测到 OGG 前收到的数据都在 head 中，先扫描这部分
+                    self._scan_ogg_pages(self._head)
+                    rest = chunk[taken:]
+        if self._format == "ogg" and rest:
+            self._scan_ogg_pages(rest)
+        self._tail = (self._tail + bytes(chunk[-self.TAIL_LIMIT:]))[-self.TAIL_LIMIT:]
+
+    def _detect_format(self):
+        head = self._head
+        if head[:4] == b"RIFF" and head[8:12] == b"WAVE":
+            self._format = "wav"
+        elif head[:4] == b"OggS":
+            self._format = "ogg"
+        elif head[:3] == b"ID3":
+            self._format = "mp3"
+            # ID3v2 标签长度为 synchsafe 整数，保证帧头落在 head 内
+            tag_size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            tag_size += 20 if head[5] & 0x10 else 10
+            self._head_limit = max(self._head_limit, tag_size + 4096)
+        elif head[0] == 0xFF and head[1] & 0xE0 == 0xE0:
+            self._format = "mp3"
+
+    def _scan_ogg_pages(self, chunk):
+        """按页遍历 OGG 数据，只读取真实页头中的 granule position，并跳过页内数据
+
+        页内数据中可能出现 "OggS" 字节，因此不做全文搜索，而是依据段表计算下一页的位置。
+        """
+        if not self._ogg_synced:
+            return
+        header = self._ogg_header
+        pos = 0
+        # head 之后还会扩展，memoryview 需及时释放
+        with memoryview(chunk) as view:
+            while pos < len(view):
+                if self._ogg_skip:
+                    step = min(self._ogg_skip, len(view) - pos)
+                    self._ogg_skip -= step
+                    pos += step
+                    continue
+
+                # 页头固定 27 字节，随后是长度为 header[26] 的段表
+                need = 27 if len(header) < 27 else 27 + header[26]
+                if len(header) < need:
+                    take = min(need - len(header), len(view) - pos)
+                    header.extend(view[pos:pos + take])
+                    pos += take
+                    if len(header) < need:
+                        break
+                    if need == 27:
+                        if header[:4] != b"OggS" or header[4] != 0:
+                            # 页边界错位（数据损坏），停止扫描，保留此前的结果
+                            self._ogg_synced = False
+                            return
+                        continue
+
+                granule = struct.unpack_from("<q", header, 6)[0]
+                if granule >= 0:
+                    self._ogg_granule = granule
+                self._ogg_skip = sum(header[27:])
+                header.clear()
+
+    def finish(self):
+        """下载结束后返回音频信息字典，无法识别的字段为 None"""
+        info = {
+            "format": self._format,
+            "duration": None,
+            "sample_rate": None,
+            "bitrate": None,
+            "channels": None,
+            "size": self.size
+        }
+        try:
+            if self._format == "wav":
+                self._parse_wav(info)
+            elif self._format == "mp3":
+                self._parse_mp3(info)
+            elif self._format == "ogg":
+                self._parse_ogg(info)
+        except (struct.error, IndexError, ZeroDivisionError):
+            pass
+        if info["duration"] is not None:
+            info["duration"] = round(info["duration"], 3)
+        return info
+
+    def _parse_wav(self, info):
+        head = bytes(self._head)
+        pos = 12
+        byte_rate = None
+        while pos + 8 <= len(head):
+            chunk_id = head[pos:pos + 4]
+            chunk_size = struct.unpack_from("<I", head, pos + 4)[0]
+            if chunk_id == b"fmt ":
+                _, channels, sample_rate, byte_rate = struct.unpack_from("<HHII", head, pos + 8)
+                info["channels"] = channels
+                info["sample_rate"] = sample_rate
+                info["bitrate"] = byte_rate * 8
+            elif chunk_id == b"data":
+                data_size = min(chunk_size, self.size - pos - 8)
+                if byte_rate:
+                    info["duration"] = data_size / byte_rate
+                return
+            pos += 8 + chunk_size + (chunk_size & 1)
+
+    def _parse_mp3(self, info):
+        head = bytes(self._head)
+        pos = 0
+        if head[:3] == b"ID3":
+            pos = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+            pos += 20 if head[5] & 0x10 else 10
+        # 查找第一个有效的 Layer III 帧头
+        while pos + 4 <= len(head):
+            if head[pos] == 0xFF and head[pos + 1] & 0xE0 == 0xE0:
+                version = (head[pos + 1] >> 3) & 0x03
+                layer = (head[pos + 1] >> 1) & 0x03
+                bitrate_index = head[pos + 2] >> 4
+                rate_index = (head[pos + 2] >> 2) & 0x03
+                if version != 1 and layer == 1 and 0 < bitrate_index < 15 and rate_index < 3:
+                    break
+            pos += 1
+        else:
+            return
+
+        mpeg1 = version == 3
+        mono = (head[pos + 3] >> 6) == 3
+        sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+        bitrate = MP3_BITRATES[1 if mpeg1 else 2][bitrate_index] * 1000
+        samples_per_frame = 1152 if mpeg1 else 576
+        info["sample_rate"] = sample_rate
+        info["channels"] = 1 if mono else 2
+
+        audio_size = self.size - pos
+        if self._tail[:3] == b"TAG" and len(self._tail) == self.TAIL_LIMIT:
+            audio_size -= self.TAIL_LIMIT
+
+        # VBR 文件通过 Xing/Info 或 VBRI 头获取总帧数
+        frames = None
+        side_info = (17 if mono else 32) if mpeg1 else (9 if mono else 17)
+        xing = pos + 4 + side_info
+        if head[xing:xing + 4] in (b"Xing", b"Info") and head[xing + 7] & 0x01:
+            frames = struct.unpack_from(">I", head, xing + 8)[0]
+        elif head[pos + 36:pos + 40] == b"VBRI":
+            frames = struct.unpack_from(">I", head, pos + 50)[0]
+
+        if frames:
+            info["duration"] = frames * samples_per_frame / sample_rate
+            info["bitrate"] = int(audio_size * 8 / info["duration"])
+        else:
+            info["duration"] = audio_size * 8 / bitrate
+            info["bitrate"] = bitrate
+
+    def _parse_ogg(self, info):
+        head = bytes(self._head)
+        segments = head[26]
+        packet = head[27 + segments:]
+        pre_skip = 0
+        if packet[:7] == b"\x01vorbis":
+            channels, sample_rate, _, nominal = struct.unpack_from("<BIiI", packet, 11)
+            granule_rate = sample_rate
+            if nominal:
+                info["bitrate"] = nominal
+        elif packet[:8] == b"OpusHead":
+            channels, pre_skip, sample_rate = struct.unpack_from("<BHI", packet, 9)
+            granule_rate = 48000  # Opus 的 granule position 固定为 48kHz
+        else:
+            return
+        info["channels"] = channels
+        info["sample_rate"] = sample_rate
+        if self._ogg_granule:
+            info["duration"] = max(0, self._ogg_granule - pre_skip) / granule_rate
+            if info["bitrate"] is None and info["duration"]:
+                info["bitrate"] = int(self.size * 8 / info["duration"])
+
+class SynthesisError(Exception):
+    """语音合成失败"""
+
+
+class SynthesisTimeout(SynthesisError):
+    """语音合成超出时限"""
+
+
+class SynthesisResult:
+    """语音合成结果：音频数据及格式、配置、耗时等信息"""
+
+    def __init__(self, audio, format, profile_name, amotion=None, timings=None, filename=None,
+                 hedged=False, info=None):
+        self.audio = audio                # 音频数据 (bytearray)
+        self.format = format              # 音频格式 (mp3/wav/ogg)
+        self.profile_name = profile_name  # 使用的声音配置名称
+        self.amotion = amotion            # 情感
+        self.timings = timings or {}      # 各阶段耗时（秒）
+        self.filename = filename          # 保存的文件路径，未落盘时为 None
+        self.hedged = hedged              # 是否由对冲请求胜出
+        self.deadline_exceeded = False    # 写入文件等后续步骤是否超出时限
+        self.info = info or {}            # 音频信息（时长、采样率、比特率、声道数、大小）
+
+    @property
+    def duration(self):
+        """音频时长（秒），无法解析时为 None"""
+        return self.info.get("duration")
+
+    @property
+    def size(self):
+        """音频字节数"""
+        return len(self.audio)
+
+    def view(self):
+        """返回音频数据的 memoryview（零拷贝）"""
+        return memoryview(self.audio)
+
+    def reader(self):
+        """返回可流式读取音频数据的文件对象"""
+        return io.BytesIO(self.audio)
+
+
 class TTSManager:
     def __init__(self):
         self.config = self.load_config()
         self.current_voice = "default"
         self.current_output_path = "default"
+        # 近期成功请求的耗时，用于计算对冲延迟
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.hedge_stats = {"requests": 0, "hedged": 0, "hedge_wins": 0, "timeouts": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
     
     def load_config(self):
         """加载配置文件"""
@@ -90,6 +383,8 @@ class TTSManager:
                         config["emotion_mapping"] = DEFAULT_CONFIG["emotion_mapping"].copy()
                     if "format_options" not in config:
                         config["format_options"] = DEFAULT_CONFIG["format_options"].copy()
+                    config.setdefault("request_deadline", DEFAULT_CONFIG["request_deadline"])
+                    config.setdefault("hedging", DEFAULT_CONFIG["hedging"].copy())
                     config.setdefault("history", [])
                     return config
             except:
@@ -293,65 +588,305 @@ class TTSManager:
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         return f"{clean_text}_{timestamp}.{format_ext}"
 
-    def text_to_speech(self, text, voice_profile_name=None):
-        """文字转语音"""
+    def resolve_voice_profile(self, voice_profile_name=None):
+        """解析声音配置，返回 (配置名称, 配置内容)"""
         # 如果没有指定声音配置，使用当前配置
-        if voice_profile_name is None:
-            voice_profile = self.config["voices"].get(self.current_voice, {})
-            profile_name = self.current_voice  # 用于历史记录
-        else:
-            voice_profile = self.config["voices"].get(voice_profile_name, {})
-            profile_name = voice_profile_name  # 用于历史记录
-        
-        if not voice_profile:
-            return "❌ 未找到声音配置"
-        
+        profile_name = self.current_voice if voice_profile_name is None else voice_profile_name
+        return profile_name, self.config["voices"].get(profile_name, {})
+
+    def hedge_delay(self):
+        """根据近期耗时的百分位计算对冲等待时间（秒）"""
+        hedging = self.config["hedging"]
+        with self._stats_lock:
+            samples = sorted(self.latencies)
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return hedging["min_delay"]
+        index = min(len(samples) - 1, int(len(samples) * hedging["percentile"] / 100))
+        return max(hedging["min_delay"], samples[index])
+
+    def get_hedge_stats(self):
+        """获取对冲请求统计：对冲率、对冲胜出率、超时/失败次数及近期耗时（含超时请求）"""
+        with self._stats_lock:
+            stats = dict(self.hedge_stats)
+            samples = sorted(self.latencies)
+        stats["hedge_rate"] = stats["hedged"] / stats["requests"] if stats["requests"] else 0.0
+        stats["hedge_win_rate"] = stats["hedge_wins"] / stats["hedged"] if stats["hedged"] else 0.0
+        stats["timeout_rate"] = stats["timeouts"] / stats["requests"] if stats["requests"] else 0.0
+        if samples:
+            stats["p50"] = samples[len(samples) // 2]
+            stats["p99"] = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        return stats
+
+    def _hedge_allowed(self):
+        """对冲请求是否仍在额度比例之内"""
+        hedging = self.config["hedging"]
+        if not hedging.get("enabled"):
+            return False
+        with self._stats_lock:
+            requests_count = self.hedge_stats["requests"]
+            hedged = self.hedge_stats["hedged"]
+        return hedged < hedging["max_ratio"] * max(requests_count, 1)
+
+    def _fetch_audio(self, session, payload, deadline_at, cancel):
+        """发送合成请求并下载音频，网络异常统一转换为 SynthesisError / SynthesisTimeout"""
         try:
-            payload = {
-                "voice": voice_profile["voice"],
-                "amotion": voice_profile.get("amotion"),
-                "format": voice_profile.get("format", "mp3"),
-                "speech": text
-            }
-            
-            response = requests.post(
-                f"{API_BASE_URL}/text-to-speech",
-                json=payload,
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                download_url = data.get("downloadUrl")
-                format_ext = voice_profile.get("format", "mp3")
-                
-                # 获取输出路径
-                output_dir = self.config["output_paths"].get(self.current_output_path, "./")
-                
-                # 使用新的文件名生成方式
-                filename = os.path.join(output_dir, self.format_filename(text, format_ext))
-                
-                # 下载音频文件
-                audio_response = requests.get(download_url)
+            return self._request_audio(session, payload, deadline_at, cancel)
+        except requests.Timeout as e:
+            raise SynthesisTimeout(f"请求超时: {str(e)}") from e
+        except requests.RequestException as e:
+            raise SynthesisError(f"网络错误: {str(e)}") from e
+
+    def _request_audio(self, session, payload, deadline_at, cancel):
+        """发送合成请求并下载音频，超过时限或被取消时抛出异常"""
+        def remaining():
+            left = deadline_at - time.monotonic()
+            if left <= 0:
+                raise SynthesisTimeout("请求超时")
+            return left
+
+        timings = {}
+        started = time.monotonic()
+        response = session.post(
+            f"{API_BASE_URL}/text-to-speech",
+            json=payload,
+            headers=self.get_headers(),
+            timeout=remaining()
+        )
+        timings["request"] = time.monotonic() - started
+        if response.status_code != 200:
+            try:
+                message = response.json().get("error", {}).get("message", "未知错误")
+            except ValueError:
+                message = f"状态码 {response.status_code}"
+            raise SynthesisError(f"请求失败: {message}")
+
+        try:
+            data = response.json()
+        except ValueError:
+            raise SynthesisError("响应格式错误: 不是有效的 JSON")
+        download_url = data.get("downloadUrl") if isinstance(data, dict) else None
+        if not download_url:
+            raise SynthesisError("响应中缺少 downloadUrl")
+
+        # 分块下载音频数据到内存，每块检查时限和取消状态，同时解析音频头信息
+        download_started = time.monotonic()
+        audio = bytearray()
+        parser = AudioInfoParser()
+        with session.get(download_url, stream=True, timeout=remaining()) as audio_response:
+            audio_response.raise_for_status()
+            for chunk in audio_response.iter_content(chunk_size=64 * 1024):
+                if cancel.is_set():
+                    raise SynthesisError("请求已取消")
+                remaining()
+                audio.extend(chunk)
+                parser.feed(chunk)
+        timings["download"] = time.monotonic() - download_started
+        return audio, parser.finish(), timings
+
+    def _run_attempts(self, payload, deadline_at):
+        """执行合成请求，必要时发出对冲请求，返回 (音频, 音频信息, 耗时, 是否对冲胜出)"""
+        executor = ThreadPoolExecutor(max_workers=2)
+        attempts = []
+
+        def start_attempt():
+            session = requests.Session()
+            cancel = threading.Event()
+            future = executor.submit(self._fetch_audio, session, payload, deadline_at, cancel)
+            attempts.append((future, session, cancel))
+            return future
+
+        with self._stats_lock:
+            self.hedge_stats["requests"] += 1
+
+        winner = None
+        error = None
+        started = time.monotonic()
+        try:
+            pending = {start_attempt()}
+            delay = self.hedge_delay()
+            # 对冲延迟超过剩余时限时不再对冲，避免浪费对冲额度
+            if self.config["hedging"].get("enabled") and delay < deadline_at - time.monotonic():
+                done, _ = wait(pending, timeout=delay)
+                # 主请求超过对冲延迟仍未完成，发出第二个相同请求
+                if not done and self._hedge_allowed():
+                    with self._stats_lock:
+                        self.hedge_stats["hedged"] += 1
+                    pending.add(start_attempt())
+
+            while pending and winner is None:
+                done, pending = wait(
+                    pending,
+                    timeout=max(0, deadline_at - time.monotonic()),
+                    return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for future in done:
+                    try:
+                        future.result()
+                        winner = future
+                        break
+                    except Exception as e:
+                        error = e
+        finally:
+            # 取消未胜出的请求并关闭连接
+            for future, session, cancel in attempts:
+                if future is not winner:
+                    cancel.set()
+                session.close()
+            executor.shutdown(wait=False)
+
+        if winner is None:
+            if error is None:
+                error = SynthesisTimeout("请求超时")
+            with self._stats_lock:
+                if isinstance(error, SynthesisTimeout):
+                    # 超时请求按实际等待时间（约等于时限）计入耗时，避免低估长尾
+                    self.hedge_stats["timeouts"] += 1
+                    self.latencies.append(time.monotonic() - started)
+                else:
+                    self.hedge_stats["errors"] += 1
+            raise error
+
+        audio, info, timings = winner.result()
+        hedged = len(attempts) > 1 and winner is attempts[1][0]
+        # 记录从主请求发出到获得音频的端到端耗时；对冲胜出时即主请求被取消前已等待的时间
+        timings["fetch"] = time.monotonic() - started
+        with self._stats_lock:
+            if hedged:
+                self.hedge_stats["hedge_wins"] += 1
+            self.latencies.append(timings["fetch"])
+        return audio, info, timings, hedged
+
+    def synthesize(self, text, voice_profile_name=None, save=False, record_history=False,
+                   deadline=None):
+        """文字转语音（库调用），返回 SynthesisResult
+
+        默认只在内存中返回音频数据，不写文件、不记录历史、不重写配置文件；
+        save=True 时写入当前输出路径，record_history=True 时追加历史记录并保存配置；
+        历史记录需要文件路径，因此 record_history=True 时即使 save=False 也会写入文件。
+        deadline 为本次调用的总时限（秒），默认使用配置中的 request_deadline；
+        音频下载完成后才超出时限时仍返回结果，并设置 result.deadline_exceeded。
+        失败时抛出 SynthesisError，请求或下载超时抛出 SynthesisTimeout。
+        """
+        profile_name, voice_profile = self.resolve_voice_profile(voice_profile_name)
+        if not voice_profile:
+            raise SynthesisError("未找到声音配置")
+
+        format_ext = voice_profile.get("format", "mp3")
+        payload = {
+            "voice": voice_profile["voice"],
+            "amotion": voice_profile.get("amotion"),
+            "format": format_ext,
+            "speech": text
+        }
+        started = time.monotonic()
+        if deadline is None:
+            deadline = self.config.get("request_deadline", DEFAULT_CONFIG["request_deadline"])
+        deadline_at = started + deadline
+        audio, info, timings, hedged = self._run_attempts(payload, deadline_at)
+
+        result = SynthesisResult(
+            audio=audio,
+            format=format_ext,
+            profile_name=profile_name,
+            amotion=voice_profile.get("amotion"),
+            timings=timings,
+            hedged=hedged,
+            info=info
+        )
+
+        if save or record_history:
+            # 获取输出路径
+            output_dir = self.config["output_paths"].get(self.current_output_path, "./")
+            filename = os.path.join(output_dir, self.format_filename(text, format_ext))
+            write_started = time.monotonic()
+            try:
+                # 库调用时可能未运行过 save_config()，输出目录不一定存在
+                os.makedirs(output_dir, exist_ok=True)
                 with open(filename, "wb") as f:
-                    f.write(audio_response.content)
-                
-                # 保存历史记录 - 使用配置名称而不是声音ID
-                self.config["history"].append({
-                    "text": text,
-                    "profile_name": profile_name,  # 配置名称
-                    "amotion": voice_profile.get("amotion"),
-                    "timestamp": datetime.now().isoformat(),
-                    "filename": filename
-                })
-                self.save_config()
-                
-                return f"🔊 语音生成成功！保存为: {filename}"
-            else:
-                return f"❌ 请求失败: {response.json().get('error', {}).get('message', '未知错误')}"
+                    f.write(audio)
+            except OSError as e:
+                raise SynthesisError(f"保存文件失败: {str(e)}") from e
+            timings["write"] = time.monotonic() - write_started
+            result.filename = filename
+
+        if record_history:
+            # 保存历史记录 - 使用配置名称而不是声音ID
+            self.config["history"].append({
+                "text": text,
+                "profile_name": profile_name,  # 配置名称
+                "amotion": voice_profile.get("amotion"),
+                "timestamp": datetime.now().isoformat(),
+                "filename": result.filename,
+                # 音频信息，统计和播放列表无需再读取音频文件
+                "duration": info.get("duration"),
+                "sample_rate": info.get("sample_rate"),
+                "bitrate": info.get("bitrate"),
+                "channels": info.get("channels"),
+                "size": info.get("size")
+            })
+            self.save_config()
+
+        timings["total"] = time.monotonic() - started
+        # 音频已成功获取，超出时限只做标记，不丢弃结果
+        result.deadline_exceeded = time.monotonic() > deadline_at
+        return result
+
+    def text_to_speech(self, text, voice_profile_name=None):
+        """文字转语音（保存文件并记录历史，返回状态信息）"""
+        try:
+            result = self.synthesize(text, voice_profile_name, save=True, record_history=True)
+            return f"🔊 语音生成成功！保存为: {result.filename}"
+        except SynthesisError as e:
+            return f"❌ {str(e)}"
         except Exception as e:
             return f"❌ 发生错误: {str(e)}"
 
+    def history_summary(self, date=None):
+        """按配置统计历史记录的数量、总时长和总大小（仅使用历史记录中的音频信息）
+
+        date 为 "YYYY-MM-DD" 时只统计当天记录，默认统计全部记录。
+        缺少时长信息的记录（旧版本记录或无法解析的音频）单独计入 unknown。
+        """
+        summary = {}
+        for record in self.config["history"]:
+            if date and not record["timestamp"].startswith(date):
+                continue
+            stats = summary.setdefault(
+                record["profile_name"], {"count": 0, "duration": 0.0, "size": 0, "unknown": 0}
+            )
+            stats["count"] += 1
+            if record.get("duration") is None:
+                stats["unknown"] += 1
+            else:
+                stats["duration"] += record["duration"]
+            stats["size"] += record.get("size") or 0
+        return summary
+
+    def build_playlist(self, playlist_path, profile_name=None, date=None):
+        """根据历史记录生成 M3U 播放列表，可按配置名称和日期 ("YYYY-MM-DD") 筛选"""
+        lines = ["#EXTM3U"]
+        playlist_dir = os.path.dirname(os.path.abspath(playlist_path))
+        for record in self.config["history"]:
+            if profile_name and record["profile_name"] != profile_name:
+                continue
+            if date and not record["timestamp"].startswith(date):
+                continue
+            duration = record.get("duration")
+            seconds = int(round(duration)) if duration is not None else -1
+            title = record["text"][:40].replace("\n", " ")
+            lines.append(f"#EXTINF:{seconds},{record['profile_name']} - {title}")
+            # 历史记录中的路径相对于当前工作目录，转换为相对于播放列表所在目录
+            lines.append(os.path.relpath(record["filename"], playlist_dir))
+
+        count = (len(lines) - 1) // 2
+        if not count:
+            return "⚠️ 没有符合条件的历史记录"
+        with open(playlist_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return f"🎵 播放列表已生成 ({count} 条): {playlist_path}"
+
 def print_menu():
     """打印菜单 - 根据图片样式优化"""
     menu_width = 40
@@ -665,11 +1200,16 @@ def main():
                             )
                             print(f"   情感: {emotion}")
                         print(f"   文件: {record['filename']}")
+                        if record.get('duration') is not None:
+                            print(f"   时长: {format_duration(record['duration'])}, "
+                                  f"大小: {record.get('size', 0) / 1024:.1f} KB")
                         print("-" * 40)
                 
                 print("\n操作选项:")
                 print("1. 清空历史记录")
-                print("2. 返回主菜单")
+                print("2. 今日时长统计")
+                print("3. 生成播放列表")
+                print("4. 返回主菜单")
                 
                 action = input("请选择操作: ")
                 
@@ -679,6 +1219,25 @@ def main():
                         print(manager.clear_history())
                     break
                 elif action == "2":
+                    summary = manager.history_summary(datetime.now().strftime("%Y-%m-%d"))
+                    if not summary:
+                        print("\n今日暂无记录")
+                    for name, stats in summary.items():
+                        print(f"\n- {name}: {stats['count']} 条, 总时长 {format_duration(stats['duration'])}, "
+                              f"总大小 {stats['size'] / 1024:.1f} KB")
+                        if stats["unknown"]:
+                            print(f"  ⚠️ 其中 {stats['unknown']} 条缺少时长信息，未计入总时长")
+                elif action == "3":
+                    profiles = ["全部"] + list(manager.config["voices"].keys())
+                    selected = manager.select_from_menu("按配置筛选", profiles, "全部")
+                    output_dir = manager.config["output_paths"].get(manager.current_output_path, "./")
+                    playlist_path = os.path.join(
+                        output_dir, f"playlist_{datetime.now().strftime('%Y%m%d%H%M%S')}.m3u"
+                    )
+                    print(manager.build_playlist(
+                        playlist_path, None if selected == "全部" else selected
+                    ))
+                elif action == "4":
                     break
                 else:
                     print("❌ 请选择有效的选项")
@@ -691,6 +1250,12 @@ def main():
                 print("✅ API连接正常")
             else:
                 print("❌ 无法连接到API，请检查API密钥和网络连接")
+            stats = manager.get_hedge_stats()
+            if stats["requests"]:
+                print(f"📊 本次运行请求 {stats['requests']} 次, 对冲率 {stats['hedge_rate']:.1%}, "
+                      f"对冲胜出 {stats['hedge_wins']} 次, 超时 {stats['timeouts']} 次, 失败 {stats['errors']} 次")
+                if "p50" in stats:
+                    print(f"   耗时 p50 {stats['p50']:.2f}s, p99 {stats['p99']:.2f}s（含超时请求）")
         
         elif choice == "7":
             print("\n感谢使用，再见！")
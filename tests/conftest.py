@@ -0,0 +1,98 @@
+import copy
+import os
+import sys
+import threading
+
+import pytest
+import requests
+
+# 测试直接导入仓库根目录下的脚本模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Fv_AI_TTA_Pro import TTSManager  # noqa: E402
+
+# MPEG-1 Layer III, 128kbps, 44100Hz, 立体声；100 帧
+MP3_AUDIO = (bytes([0xFF, 0xFB, 0x90, 0x00]) + b"\0" * 413) * 100
+
+
+class FakeResponse:
+    """requests.Response 替身"""
+
+    def __init__(self, status_code=200, json_data=None, content=b""):
+        self.status_code = status_code
+        self._json = json_data
+        self.content = content
+
+    def json(self):
+        if self._json is None:
+            raise ValueError("响应不是 JSON")
+        return self._json
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"状态码 {self.status_code}")
+
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """requests.Session 替身
+
+    每次 post 按顺序取出 posts 中预设的 (延迟秒数, 响应或异常)，未预设时立即成功。
+    延迟期间关闭会话会使请求提前失败，延迟超过 timeout 时抛出 requests.ReadTimeout。
+    """
+
+    posts = []
+    post_count = 0
+    audio = MP3_AUDIO
+    lock = threading.Lock()
+
+    def __init__(self):
+        self._closed = threading.Event()
+
+    def post(self, url, json=None, headers=None, timeout=None):
+        cls = type(self)
+        with cls.lock:
+            cls.post_count += 1
+            delay, result = cls.posts.pop(0) if cls.posts else (0, None)
+        if self._closed.wait(min(delay, timeout)):
+            raise requests.ConnectionError("会话已关闭")
+        if delay > timeout:
+            raise requests.ReadTimeout("读取超时")
+        if isinstance(result, Exception):
+            raise result
+        return result or FakeResponse(json_data={"downloadUrl": "https://example.com/audio.mp3"})
+
+    def get(self, url, stream=False, timeout=None):
+        return FakeResponse(content=type(self).audio)
+
+    def close(self):
+        self._closed.set()
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    """替换 requests.Session，返回可配置的替身类"""
+    session_cls = type("Session", (FakeSession,), {"posts": [], "post_count": 0})
+    monkeypatch.setattr(requests, "Session", session_cls)
+    return session_cls
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch, fake_session):
+    """在临时目录中运行、输出到 tmp_path/out 的 TTSManager"""
+    monkeypatch.chdir(tmp_path)
+    manager = TTSManager()
+    # load_config 返回默认配置的浅拷贝，深拷贝以免测试之间共享 history 等可变对象
+    manager.config = copy.deepcopy(manager.config)
+    manager.config["api_key"] = "test-key"
+    manager.config["output_paths"] = {"default": str(tmp_path / "out")}
+    return manager
@@ -0,0 +1,141 @@
+import io
+import struct
+import wave
+
+import pytest
+
+from Fv_AI_TTA_Pro import AudioInfoParser
+
+# 不同的分块大小，覆盖 ID3 标签和 OGG 页跨块的情况
+CHUNK_SIZES = [1, 7, 4096, 64 * 1024, 10 ** 7]
+
+# MPEG-1 Layer III, 128kbps, 44100Hz, 立体声；单帧 417 字节
+MP3_HEADER = bytes([0xFF, 0xFB, 0x90, 0x00])
+MP3_FRAME = MP3_HEADER + b"\0" * 413
+
+
+def parse(data, chunk_size):
+    parser = AudioInfoParser()
+    for i in range(0, len(data), chunk_size):
+        parser.feed(data[i:i + chunk_size])
+    return parser.finish()
+
+
+def id3v2(size):
+    """生成指定内容长度的 ID3v2 标签"""
+    synchsafe = bytes([(size >> 21) & 0x7F, (size >> 14) & 0x7F, (size >> 7) & 0x7F, size & 0x7F])
+    return b"ID3\x03\x00\x00" + synchsafe + b"\0" * size
+
+
+def ogg_page(granule, body, first=False):
+    return (b"OggS" + bytes([0, 0x02 if first else 0]) + struct.pack("<qIII", granule, 1, 0, 0)
+            + bytes([1, len(body)]) + body)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_wav(chunk_size):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(22050)
+        w.writeframes(b"\0" * 22050 * 4 * 2)
+    data = buf.getvalue()
+
+    info = parse(data, chunk_size)
+    assert info == {
+        "format": "wav",
+        "duration": 2.0,
+        "sample_rate": 22050,
+        "bitrate": 22050 * 4 * 8,
+        "channels": 2,
+        "size": len(data)
+    }
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_mp3_cbr_with_id3_tags(chunk_size):
+    data = id3v2(20000) + MP3_FRAME * 1000 + b"TAG" + b"\0" * 125
+
+    info = parse(data, chunk_size)
+    assert info["format"] == "mp3"
+    assert info["sample_rate"] == 44100
+    assert info["channels"] == 2
+    assert info["bitrate"] == 128000
+    assert info["duration"] == round(417 * 1000 * 8 / 128000, 3)
+    assert info["size"] == len(data)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_mp3_xing_behind_large_id3_tag(chunk_size):
+    # 帧头 + 32 字节 side info 后为 Xing 头，标志位 1 表示包含帧数
+    xing_frame = MP3_HEADER + b"\0" * 32 + b"Xing" + struct.pack(">II", 1, 500)
+    xing_frame += b"\0" * (417 - len(xing_frame))
+    data = id3v2(20000) + xing_frame + MP3_FRAME * 299
+
+    info = parse(data, chunk_size)
+    assert info["duration"] == round(500 * 1152 / 44100, 3)
+    assert info["bitrate"] == int(417 * 300 * 8 / (500 * 1152 / 44100))
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_mp3_vbri(chunk_size):
+    vbri_frame = MP3_HEADER + b"\0" * 32 + b"VBRI" + b"\0" * 10 + struct.pack(">I", 250)
+    vbri_frame += b"\0" * (417 - len(vbri_frame))
+    data = vbri_frame + MP3_FRAME * 99
+
+    info = parse(data, chunk_size)
+    assert info["duration"] == round(250 * 1152 / 44100, 3)
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_ogg_vorbis(chunk_size):
+    ident = b"\x01vorbis" + struct.pack("<IBIiIi", 0, 2, 44100, 0, 96000, 0) + b"\x01"
+    pages = [ogg_page(0, ident, first=True)]
+    pages += [ogg_page(granule, b"\0" * 200) for granule in range(1000, 441001, 1000)]
+    # 结尾页 granule 为 -1（没有完整数据包），应被忽略
+    pages.append(ogg_page(-1, b"\0" * 10))
+    data = b"".join(pages)
+
+    info = parse(data, chunk_size)
+    assert info == {
+        "format": "ogg",
+        "duration": 10.0,
+        "sample_rate": 44100,
+        "bitrate": 96000,
+        "channels": 2,
+        "size": len(data)
+    }
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_ogg_ignores_oggs_inside_page_data(chunk_size):
+    ident = b"\x01vorbis" + struct.pack("<IBIiIi", 0, 1, 16000, 0, 32000, 0) + b"\x01"
+    # 页内数据中出现 "OggS" 和巨大的 granule，不应被当作页头
+    fake_header = b"OggS\x00\x00" + struct.pack("<q", 10 ** 12)
+    data = (ogg_page(0, ident, first=True)
+            + ogg_page(16000, fake_header + b"\0" * 100)
+            + ogg_page(32000, b"\0" * 50 + fake_header))
+
+    info = parse(data, chunk_size)
+    assert info["duration"] == 2.0
+    assert info["sample_rate"] == 16000
+
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_ogg_opus(chunk_size):
+    head = b"OpusHead" + struct.pack("<BBHIhB", 1, 1, 312, 24000, 0, 0)
+    data = ogg_page(0, head, first=True) + ogg_page(48000 * 3 + 312, b"\0" * 100)
+
+    info = parse(data, chunk_size)
+    assert info["format"] == "ogg"
+    assert info["channels"] == 1
+    assert info["sample_rate"] == 24000
+    assert info["duration"] == 3.0
+
+
+def test_unknown_format():
+    info = parse(b"not audio data at all", 4)
+    assert info["format"] is None
+    assert info["duration"] is None
+    assert info["size"] == 21
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from Fv_AI_TTA_Pro import SynthesisError, SynthesisTimeout
+from conftest import FakeResponse
+
+
+@pytest.fixture
+def hedging(manager):
+    manager.config["hedging"].update(enabled=True, min_delay=0.1, max_ratio=1.0)
+    return manager.config["hedging"]
+
+
+def test_hedged_attempt_wins(manager, fake_session, hedging):
+    fake_session.posts.extend([(2.0, None), (0, None)])
+
+    started = time.monotonic()
+    result = manager.synthesize("你好", deadline=5)
+    elapsed = time.monotonic() - started
+
+    assert result.hedged
+    assert elapsed < 1.0
+    assert fake_session.post_count == 2
+    stats = manager.get_hedge_stats()
+    assert stats["requests"] == 1
+    assert stats["hedged"] == 1
+    assert stats["hedge_wins"] == 1
+    # 端到端耗时包含对冲延迟
+    assert stats["p50"] >= hedging["min_delay"]
+
+
+def test_stalled_post_times_out_at_deadline(manager, fake_session):
+    fake_session.posts.append((5.0, None))
+
+    started = time.monotonic()
+    with pytest.raises(SynthesisTimeout):
+        manager.synthesize("你好", deadline=0.3)
+    elapsed = time.monotonic() - started
+
+    assert 0.3 <= elapsed < 0.6
+    stats = manager.get_hedge_stats()
+    assert stats["timeouts"] == 1
+    assert stats["timeout_rate"] == 1.0
+    assert stats["p99"] >= 0.3
+
+
+def test_no_hedge_when_delay_exceeds_remaining(manager, fake_session, hedging):
+    hedging["min_delay"] = 1.0
+    fake_session.posts.append((5.0, None))
+
+    with pytest.raises(SynthesisTimeout):
+        manager.synthesize("你好", deadline=0.3)
+
+    assert fake_session.post_count == 1
+    assert manager.get_hedge_stats()["hedged"] == 0
+
+
+def test_max_ratio_limits_hedges(manager, fake_session, hedging):
+    hedging["max_ratio"] = 0.5
+    fake_session.posts.extend([(0.5, None), (0, None)])
+    assert manager.synthesize("你好", deadline=5).hedged
+
+    # 已对冲 1 次 / 共 2 次请求，达到 50% 上限，不再对冲
+    fake_session.posts.extend([(0.3, None), (0, None)])
+    result = manager.synthesize("你好", deadline=5)
+
+    assert not result.hedged
+    assert fake_session.post_count == 3
+    stats = manager.get_hedge_stats()
+    assert stats["requests"] == 2
+    assert stats["hedged"] == 1
+
+
+def test_primary_error_before_hedge_delay(manager, fake_session, hedging):
+    hedging["min_delay"] = 0.5
+    fake_session.posts.append((0, FakeResponse(400, {"error": {"message": "余额不足"}})))
+
+    with pytest.raises(SynthesisError, match="请求失败: 余额不足"):
+        manager.synthesize("你好", deadline=5)
+
+    assert fake_session.post_count == 1
+    stats = manager.get_hedge_stats()
+    assert stats["hedged"] == 0
+    assert stats["errors"] == 1
+    assert stats["timeouts"] == 0
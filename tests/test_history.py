@@ -0,0 +1,51 @@
+import os
+
+
+def add_record(manager, filename, timestamp, duration=None, profile_name="default"):
+    manager.config["history"].append({
+        "text": "你好",
+        "profile_name": profile_name,
+        "amotion": None,
+        "timestamp": timestamp,
+        "filename": filename,
+        "duration": duration,
+        "size": 1024 if duration is not None else None
+    })
+
+
+def test_history_summary_counts_unknown_durations(manager):
+    add_record(manager, "a.mp3", "2026-10-19T08:00:00", 2.5)
+    add_record(manager, "b.mp3", "2026-10-19T09:00:00")
+    add_record(manager, "c.mp3", "2026-10-18T09:00:00", 4.0)
+
+    assert manager.history_summary("2026-10-19") == {
+        "default": {"count": 2, "duration": 2.5, "size": 1024, "unknown": 1}
+    }
+    assert manager.history_summary()["default"]["count"] == 3
+
+
+def test_build_playlist_paths_relative_to_playlist(manager, tmp_path):
+    # 历史记录中的相对路径以当前工作目录 (tmp_path) 为基准
+    add_record(manager, os.path.join("out", "a.mp3"), "2026-10-19T08:00:00", 2.5)
+    add_record(manager, os.path.join("out", "b.mp3"), "2026-10-19T09:00:00")
+    os.makedirs("out")
+    playlist_path = os.path.join("out", "playlist.m3u")
+
+    assert manager.build_playlist(playlist_path).startswith("🎵 播放列表已生成 (2 条)")
+    with open(playlist_path, encoding="utf-8") as f:
+        lines = f.read().splitlines()
+    assert lines == [
+        "#EXTM3U",
+        "#EXTINF:2,default - 你好",
+        "a.mp3",
+        "#EXTINF:-1,default - 你好",
+        "b.mp3"
+    ]
+
+
+def test_build_playlist_without_matches(manager, tmp_path):
+    add_record(manager, "a.mp3", "2026-10-19T08:00:00", 2.5)
+    playlist_path = str(tmp_path / "playlist.m3u")
+
+    assert manager.build_playlist(playlist_path, profile_name="other") == "⚠️ 没有符合条件的历史记录"
+    assert not os.path.exists(playlist_path)
@@ -0,0 +1,65 @@
+import os
+
+import pytest
+
+from Fv_AI_TTA_Pro import SynthesisError
+from conftest import MP3_AUDIO, FakeResponse
+
+
+def test_synthesize_in_memory_by_default(manager, tmp_path, monkeypatch):
+    saved = []
+    monkeypatch.setattr(manager, "save_config", lambda: saved.append(True))
+
+    result = manager.synthesize("你好")
+
+    assert bytes(result.audio) == MP3_AUDIO
+    assert result.format == "mp3"
+    assert result.profile_name == "default"
+    assert result.filename is None
+    assert result.info["format"] == "mp3"
+    assert result.duration == round(417 * 100 * 8 / 128000, 3)
+    assert set(result.timings) >= {"request", "download", "total"}
+    assert not os.path.exists(tmp_path / "out")
+    assert manager.config["history"] == []
+    assert saved == []
+
+
+def test_synthesize_record_history_writes_file(manager, tmp_path):
+    result = manager.synthesize("你好", record_history=True)
+
+    # 输出目录此前不存在，写入时自动创建
+    assert os.path.dirname(result.filename) == str(tmp_path / "out")
+    with open(result.filename, "rb") as f:
+        assert f.read() == MP3_AUDIO
+
+    record = manager.config["history"][-1]
+    assert record["filename"] == result.filename
+    assert record["profile_name"] == "default"
+    for key in ("duration", "sample_rate", "bitrate", "channels", "size"):
+        assert record[key] == result.info[key]
+    assert record["size"] == len(MP3_AUDIO)
+    assert os.path.exists(tmp_path / "FV_tts_config.json")
+
+
+def test_synthesize_write_failure_raises_synthesis_error(manager, tmp_path):
+    # 输出路径被同名文件占用，无法创建目录
+    (tmp_path / "out").write_bytes(b"")
+    with pytest.raises(SynthesisError):
+        manager.synthesize("你好", save=True)
+
+
+def test_synthesize_wraps_invalid_json(manager, fake_session):
+    fake_session.posts.append((0, FakeResponse(content=b"<html>")))
+    with pytest.raises(SynthesisError, match="响应格式错误"):
+        manager.synthesize("你好")
+
+
+def test_text_to_speech_status_strings(manager, fake_session):
+    message = manager.text_to_speech("你好")
+    assert message.startswith("🔊 语音生成成功！保存为: ")
+    assert message.endswith(".mp3")
+
+    fake_session.posts.append((0, FakeResponse(400, {"error": {"message": "余额不足"}})))
+    assert manager.text_to_speech("你好") == "❌ 请求失败: 余额不足"
+
+    assert manager.text_to_speech("你好", "missing") == "❌ 未找到声音配置"